@@ -0,0 +1,321 @@
+import time
+
+_START = time.perf_counter()
+
+import bisect
+import json
+import math
+import pickle
+import sys
+
+# ==================================================
+# SCORING TABLES
+# ==================================================
+# The interpret models take most of the startup time to import and unpickle.
+# EBMs are additive lookup tables, so we export them once (bins, term scores,
+# intercept, encoder classes) as plain Python lists/dicts and score with the
+# standard library only.
+
+TABLE_FILES = {
+    "finance": "ebm_finance_tables.pkl",
+    "health": "ebm_health_tables.pkl"
+}
+
+MODEL_FILES = {
+    "finance": ("ebm_finance.pkl", "fin_encoders.pkl"),
+    "health": ("ebm_health.pkl", "health_encoders.pkl")
+}
+
+
+def export_tables(model, encoders, path, medians=None):
+    # Heavy imports stay here so the scoring path never pays for them
+    import numpy as np
+
+    levels = []
+    for feature_bins in model.bins_:
+        feature_levels = []
+        for bins in feature_bins:
+            if isinstance(bins, dict):
+                feature_levels.append({"categories": {str(k): int(v) for k, v in bins.items()}})
+            else:
+                feature_levels.append({"cuts": [float(c) for c in bins]})
+        levels.append(feature_levels)
+
+    terms = []
+    for features, scores in zip(model.term_features_, model.term_scores_):
+        terms.append({
+            "features": [int(i) for i in features],
+            "scores": np.asarray(scores, dtype=float).tolist()
+        })
+
+    tables = {
+        "feature_names": [str(n) for n in model.feature_names_in_],
+        "bins": levels,
+        "terms": terms,
+        "intercept": float(np.ravel(model.intercept_)[0]),
+        "link": getattr(model, "link_", "identity"),
+        "encoders": {col: [str(c) for c in le.classes_] for col, le in encoders.items()},
+        # Training fills missing numerics with these (train_ebm.clean_missing)
+        "medians": {str(col): float(v) for col, v in (medians or {}).items()}
+    }
+
+    with open(path, "wb") as f:
+        pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return tables
+
+
+def export_all():
+    # Returns a process exit code: 0 if at least one domain was exported
+    try:
+        from train_ebm import STATE_FILE, stats_medians
+    except ImportError as e:
+        print(f"  ! Export needs the training dependencies: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        with open(STATE_FILE, "rb") as f:
+            state = pickle.load(f)
+    except FileNotFoundError:
+        print(f"  ! {STATE_FILE} not found: exporting without imputation medians, "
+              "missing values will not be filled. Retrain to add them.", file=sys.stderr)
+        state = {}
+
+    exported = 0
+    for domain, (model_file, enc_file) in MODEL_FILES.items():
+        try:
+            with open(model_file, "rb") as f:
+                model = pickle.load(f)
+            with open(enc_file, "rb") as f:
+                encoders = pickle.load(f)
+        except FileNotFoundError as e:
+            print(f"  ! Skipping {domain}: {e.filename} not found.", file=sys.stderr)
+            continue
+
+        medians = stats_medians(state[domain]["stats"]) if domain in state else None
+        export_tables(model, encoders, TABLE_FILES[domain], medians)
+        print(f"  > Exported {TABLE_FILES[domain]}", file=sys.stderr)
+        exported += 1
+
+    if not exported:
+        print("  ! Nothing exported. Please train models first.", file=sys.stderr)
+        return 1
+    return 0
+
+
+_TABLES = {}
+
+
+def load_tables(domain):
+    if domain not in _TABLES:
+        with open(TABLE_FILES[domain], "rb") as f:
+            tables = pickle.load(f)
+        tables["encoders"] = {
+            col: {label: i for i, label in enumerate(classes)}
+            for col, classes in tables["encoders"].items()
+        }
+        _TABLES[domain] = tables
+    return _TABLES[domain]
+
+
+# ==================================================
+# RAW VALUES → FEATURES
+# ==================================================
+ENGINEERED = {
+    "finance": ("loan_to_income_ratio", "total_assets", "asset_to_loan_ratio")
+}
+
+ASSET_COLS = (
+    "residential_assets_value",
+    "commercial_assets_value",
+    "luxury_assets_value",
+    "bank_asset_value"
+)
+
+
+def to_number(name, value):
+    # JSON null / NaN is a missing value; anything else must parse
+    if value is None:
+        return None
+    try:
+        x = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: expected a number, got {value!r}")
+    return None if math.isnan(x) else x
+
+
+def engineer_features(domain, row):
+    # Same feature engineering as train_ebm / test_model; a missing input
+    # leaves the engineered feature missing, as it would be at training time
+    if domain == "finance":
+        loan = row.get("loan_amount")
+        income = row.get("income_annum")
+        assets = [row.get(col) for col in ASSET_COLS]
+
+        ratio = loan / (income + 1) if loan is not None and income is not None else None
+        total = sum(assets) if None not in assets else None
+
+        row["loan_to_income_ratio"] = ratio
+        row["total_assets"] = total
+        row["asset_to_loan_ratio"] = total / (loan + 1) if total is not None and loan is not None else None
+
+    return row
+
+
+def prepare_row(tables, domain, raw):
+    if not isinstance(raw, dict):
+        raise ValueError(f"{domain}: expected a JSON object")
+
+    engineered = ENGINEERED.get(domain, ())
+    required = [n for n in tables["feature_names"] if n not in engineered]
+    missing = [n for n in required if n not in raw]
+    if missing:
+        raise ValueError(f"{domain}: missing fields: {', '.join(missing)}")
+
+    row = {}
+    for name in required:
+        if name in tables["encoders"]:
+            row[name] = raw[name]
+        else:
+            row[name] = to_number(name, raw[name])
+
+    row = engineer_features(domain, row)
+
+    # Impute like train_ebm.clean_missing so nothing lands in the unused missing bin
+    for name, median in tables.get("medians", {}).items():
+        if row.get(name) is None:
+            row[name] = median
+    return row
+
+
+def encode_value(codes, value):
+    # Matches train_ebm: missing → "Unknown", unseen → first class
+    label = "Unknown" if value is None else str(value)
+    return codes.get(label, 0)
+
+
+def _bin_index(level, value, size):
+    # interpret layout: 0 = missing, 1..n = bins, size - 1 = unknown
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 0
+
+    if "cuts" in level:
+        try:
+            x = float(value)
+        except (TypeError, ValueError):
+            return size - 1
+        if math.isnan(x):
+            return 0
+        return bisect.bisect_right(level["cuts"], x) + 1
+
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return level["categories"].get(str(value), size - 1)
+
+
+def score_row(tables, row):
+    values = [row.get(name) for name in tables["feature_names"]]
+    for i, name in enumerate(tables["feature_names"]):
+        if name in tables["encoders"]:
+            values[i] = encode_value(tables["encoders"][name], values[i])
+
+    score = tables["intercept"]
+    for term in tables["terms"]:
+        features = term["features"]
+        cell = term["scores"]
+        for feature in features:
+            feature_levels = tables["bins"][feature]
+            level = feature_levels[min(len(feature_levels), len(features)) - 1]
+            cell = cell[_bin_index(level, values[feature], len(cell))]
+        score += cell
+
+    return score
+
+
+def predict(domain, raw):
+    tables = load_tables(domain)
+    score = score_row(tables, prepare_row(tables, domain, raw))
+
+    if tables["link"] == "logit":
+        prob = 1.0 / (1.0 + math.exp(-score))
+        return {"approved": prob >= 0.5, "probability": round(prob, 6)}
+
+    return {"premium": round(score, 2)}
+
+
+def score_record(record, default_domain):
+    # Accepts test_model-style {"finance": {...}, "health": {...}} or a flat applicant
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    if any(domain in record for domain in TABLE_FILES):
+        return {
+            domain: predict(domain, record[domain])
+            for domain in TABLE_FILES if domain in record
+        }
+    return predict(default_domain, record)
+
+
+# ==================================================
+# CLI
+# ==================================================
+def _emit(line, domain):
+    # Returns False when the record could not be scored
+    ok = True
+    try:
+        result = score_record(json.loads(line), domain)
+    except Exception as e:
+        result = {"error": str(e)}
+        ok = False
+    sys.stdout.write(json.dumps(result) + "\n")
+    return ok
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fast single-applicant scoring.")
+    parser.add_argument("input", nargs="?", help="Applicant .json or .jsonl file (default: stdin)")
+    parser.add_argument("--domain", choices=sorted(TABLE_FILES), default="finance",
+                        help="Model for flat applicant records")
+    parser.add_argument("--serve-stdin", action="store_true",
+                        help="Score one JSON applicant per stdin line until EOF")
+    parser.add_argument("--export", action="store_true",
+                        help="Rebuild scoring tables from the trained .pkl models")
+    parser.add_argument("--timing", action="store_true",
+                        help="Report startup and total time on stderr")
+    args = parser.parse_args(argv)
+
+    if args.export:
+        return export_all()
+
+    # Tables load lazily, per domain, as records need them
+    if args.timing:
+        print(f"startup: {(time.perf_counter() - _START) * 1000:.1f} ms", file=sys.stderr)
+
+    ok = True
+    if args.serve_stdin:
+        # Long-running: errors are reported per line, never as an exit status
+        for line in sys.stdin:
+            line = line.strip()
+            if line:
+                _emit(line, args.domain)
+                sys.stdout.flush()
+    elif args.input and args.input.endswith(".jsonl"):
+        with open(args.input) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    ok = _emit(line, args.domain) and ok
+    elif args.input:
+        with open(args.input) as f:
+            ok = _emit(f.read(), args.domain)
+    else:
+        ok = _emit(sys.stdin.read(), args.domain)
+
+    if args.timing:
+        print(f"total: {(time.perf_counter() - _START) * 1000:.1f} ms", file=sys.stderr)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import io
+import json
+import os
+import pickle
+
+import pytest
+
+import score
+
+
+# ==================================================
+# CLI EXIT CODES (stdlib only, hand-built table)
+# ==================================================
+@pytest.fixture
+def tiny_tables(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(score, "_TABLES", {})
+    tables = {
+        "feature_names": ["age", "sex"],
+        "bins": [[{"cuts": [30.0, 50.0]}], [{"categories": {"0": 1, "1": 2}}]],
+        "terms": [
+            {"features": [0], "scores": [0.0, -100.0, 0.0, 100.0, 0.0]},
+            {"features": [1], "scores": [0.0, 10.0, -10.0, 0.0]}
+        ],
+        "intercept": 1000.0,
+        "link": "identity",
+        "encoders": {"sex": ["female", "male"]},
+        "medians": {"age": 40.0}
+    }
+    with open(score.TABLE_FILES["health"], "wb") as f:
+        pickle.dump(tables, f)
+
+
+def run_main(monkeypatch, capsys, argv, stdin=""):
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+    code = score.main(argv)
+    lines = capsys.readouterr().out.splitlines()
+    return code, [json.loads(line) for line in lines]
+
+
+GOOD = json.dumps({"health": {"age": 60, "sex": "female"}})
+BAD = json.dumps({"health": {"age": "old", "sex": "female"}})
+
+
+def test_single_record_exit_codes(tiny_tables, monkeypatch, capsys):
+    code, out = run_main(monkeypatch, capsys, [], GOOD)
+    assert code == 0
+    assert out == [{"health": {"premium": 1110.0}}]
+
+    code, out = run_main(monkeypatch, capsys, [], BAD)
+    assert code == 1
+    assert "error" in out[0]
+
+    code, out = run_main(monkeypatch, capsys, [], "not json")
+    assert code == 1
+
+
+def test_jsonl_exit_code_fails_on_any_bad_line(tiny_tables, monkeypatch, capsys, tmp_path):
+    path = tmp_path / "batch.jsonl"
+    path.write_text(GOOD + "\n" + BAD + "\n")
+
+    code, out = run_main(monkeypatch, capsys, [str(path)])
+    assert code == 1
+    assert out[0] == {"health": {"premium": 1110.0}}
+    assert "error" in out[1]
+
+
+def test_serve_stdin_reports_errors_per_line(tiny_tables, monkeypatch, capsys):
+    code, out = run_main(monkeypatch, capsys, ["--serve-stdin"], GOOD + "\nnot json\n" + GOOD + "\n")
+    assert code == 0
+    assert len(out) == 3
+    assert "error" in out[1]
+
+
+def test_missing_fields_and_nulls(tiny_tables):
+    with pytest.raises(ValueError, match="missing fields: sex"):
+        score.predict("health", {"age": 60})
+
+    # null is a missing value and takes the training median (40 → bin 2)
+    assert score.predict("health", {"age": None, "sex": "male"}) == {"premium": 990.0}
+    # Unseen label → first class, numeric strings are coerced
+    assert score.predict("health", {"age": "20", "sex": "other"}) == {"premium": 910.0}
+
+
+def test_export_without_state_or_models(tmp_path, monkeypatch):
+    pytest.importorskip("interpret")
+    pytest.importorskip("tqdm")
+    monkeypatch.chdir(tmp_path)
+
+    assert score.export_all() == 1
+    assert not os.path.exists(score.TABLE_FILES["health"])
+
+
+# ==================================================
+# PARITY WITH THE EBMs
+# ==================================================
+@pytest.fixture(scope="module")
+def trained(tmp_path_factory):
+    pytest.importorskip("interpret")
+    pytest.importorskip("tqdm")
+    import train_ebm
+    from test_incremental import make_health_rows, make_loan_rows
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("trained"))
+    try:
+        make_loan_rows(800, seed=1).to_csv("loan_data.csv", index=False)
+        make_health_rows(800, seed=1).to_csv("hi.csv", index=False)
+        train_ebm.train_models()
+        yield train_ebm
+    finally:
+        os.chdir(cwd)
+
+
+def encode_like_scorer(X, encoders):
+    # Unseen and missing labels → first class, as test_model.apply_encoders does
+    for col, le in encoders.items():
+        codes = {label: i for i, label in enumerate(le.classes_)}
+        X[col] = X[col].map(lambda v: codes.get(str(v), 0) if v == v else 0)
+    return X
+
+
+def raw_records(df):
+    return [
+        {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+        for row in json.loads(df.to_json(orient="records"))
+    ]
+
+
+def test_scores_match_model_with_nans_and_unseen_labels(trained, monkeypatch):
+    import numpy as np
+    from test_incremental import make_health_rows, make_loan_rows
+
+    train_ebm = trained
+    monkeypatch.setattr(score, "_TABLES", {})
+    with open(train_ebm.STATE_FILE, "rb") as f:
+        state = pickle.load(f)
+
+    # ---------------- FINANCE ----------------
+    df = make_loan_rows(200, seed=7)
+    df.loc[::3, "bank_asset_value"] = np.nan
+    df.loc[1::5, "income_annum"] = np.nan
+    df.loc[::7, "education"] = " Postgraduate"
+
+    with open("ebm_finance.pkl", "rb") as f:
+        fin = pickle.load(f)
+    with open("fin_encoders.pkl", "rb") as f:
+        fin_enc = pickle.load(f)
+
+    X, _ = train_ebm.prepare_finance(df.copy())
+    X = encode_like_scorer(X, fin_enc)
+    X = train_ebm.clean_missing(X, state["finance"]["stats"])
+    expected = fin.predict_proba(X)[:, 1]
+
+    records = raw_records(df.drop(columns=["loan_id", "loan_status"]))
+    got = np.array([score.predict("finance", r)["probability"] for r in records])
+    assert np.abs(got - expected).max() < 1e-5
+
+    # ---------------- HEALTH ----------------
+    dh = make_health_rows(200, seed=7)
+    dh.loc[::3, "bmi"] = np.nan
+    dh.loc[::4, "city"] = "Springfield"
+
+    with open("ebm_health.pkl", "rb") as f:
+        health = pickle.load(f)
+    with open("health_encoders.pkl", "rb") as f:
+        health_enc = pickle.load(f)
+
+    X, _, _ = train_ebm.prepare_health(dh.copy(), state["health"]["numeric_cols"])
+    X = encode_like_scorer(X, health_enc)
+    X = train_ebm.clean_missing(X, state["health"]["stats"])
+    expected = health.predict(X)
+
+    records = raw_records(dh.drop(columns=["claim"]))
+    got = np.array([score.predict("health", r)["premium"] for r in records])
+    assert np.abs(got - expected).max() < 0.01
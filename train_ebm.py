@@ -1,3 +1,8 @@
+import argparse
+import copy
+import hashlib
+import io
+import os
 import pandas as pd
 import numpy as np
 import pickle
@@ -6,20 +11,126 @@ from tqdm import tqdm
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder
-from sklearn.metrics import accuracy_score, r2_score
+from sklearn.metrics import accuracy_score, log_loss, mean_squared_error, r2_score
 
 from interpret.glassbox import (
     ExplainableBoostingClassifier,
     ExplainableBoostingRegressor
 )
 
+from score import TABLE_FILES, export_tables
+
+STATE_FILE = "train_state.pkl"
+
+# Incremental update settings
+MEDIAN_BINS = 256           # Histogram resolution for running medians
+MIN_INCREMENTAL_ROWS = 50   # Smaller batches wait for the next run
+DRIFT_THRESHOLD = 0.5       # Mean shift (in historical std units) that forces a refit
+ACCURACY_DROP = 0.05        # Finance accuracy loss on new rows that forces a refit
+R2_DROP = 0.10              # Health R2 loss on new rows that forces a refit
+DELTA_OUTER_BAGS = 2        # Cheap delta fit: main effects only, few bags
+DELTA_SHRINK_ROWS = 10      # Rows a delta bin needs before half its score is kept
+DELTA_HOLDOUT = 0.2         # Newest share of a batch kept out of the delta fit
+DELTA_TOLERANCE = 0.25      # Held-out loss increase (relative) that forces a refit;
+                            # loose because a day's held-out slice is small and noisy
+
+# ---------------------------------------------------
+# Read only the rows appended since the last run
+# ---------------------------------------------------
+def read_csv_tail(path, offset=0, columns=None):
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    if offset == 0:
+        return pd.read_csv(io.BytesIO(data)), len(data)
+
+    # Leave a partially written last line for the next run
+    data = data[:data.rfind(b"\n") + 1]
+    if not data.strip():
+        return pd.DataFrame(columns=columns), offset
+
+    df = pd.read_csv(io.BytesIO(data), header=None, names=columns)
+    return df, offset + len(data)
+
+
+def csv_fingerprint(path, offset):
+    # Size, header hash and the byte just before the read offset: enough to
+    # tell an append from a file that was swapped out underneath us
+    with open(path, "rb") as f:
+        header = f.readline()
+        f.seek(max(offset - 1, 0))
+        last_byte = f.read(1)
+        size = f.seek(0, os.SEEK_END)
+    return {
+        "size": size,
+        "header_hash": hashlib.sha1(header).hexdigest(),
+        "last_byte": last_byte
+    }
+
+
+def csv_replaced(path, offset, stored):
+    current = csv_fingerprint(path, offset)
+    return (
+        current["size"] < stored["size"]
+        or current["header_hash"] != stored["header_hash"]
+        or current["last_byte"] != stored["last_byte"]
+    )
+
+# ---------------------------------------------------
+# Shared preprocessing (full fit + incremental update)
+# ---------------------------------------------------
+def prepare_finance(df_f):
+    df_f.columns = df_f.columns.str.strip()
+    df_f = df_f.replace("", np.nan)
+
+    # Normalize labels
+    df_f["loan_status"] = df_f["loan_status"].astype(str).str.strip().str.capitalize()
+    df_f.loc[~df_f["loan_status"].isin(["Approved", "Rejected"]), "loan_status"] = "Rejected"
+
+    # Feature Engineering
+    df_f["loan_to_income_ratio"] = df_f["loan_amount"] / (df_f["income_annum"] + 1)
+    df_f["total_assets"] = (df_f["residential_assets_value"] + df_f["commercial_assets_value"] +
+                           df_f["luxury_assets_value"] + df_f["bank_asset_value"])
+
+    y_f = df_f["loan_status"].map({"Approved": 1, "Rejected": 0})
+    X_f = df_f.drop(columns=["loan_id", "loan_status"], errors="ignore")
+    return X_f, y_f
+
+
+def prepare_health(df_h, numeric_cols=None):
+    df_h.columns = df_h.columns.str.strip()
+
+    if "claim" not in df_h.columns:
+        raise ValueError(f"'claim' missing. Found: {df_h.columns.tolist()}")
+
+    y_h = df_h["claim"]
+    X_h = df_h.drop(columns=["claim"])
+
+    # Incremental batches reuse the column types chosen at full fit
+    if numeric_cols is not None:
+        for col in numeric_cols:
+            X_h[col] = pd.to_numeric(X_h[col], errors='coerce')
+        return X_h, y_h, numeric_cols
+
+    # FIX: Safe Numeric Conversion
+    numeric_cols = []
+    for col in X_h.columns:
+        # Attempt numeric conversion, invalid becomes NaN
+        converted = pd.to_numeric(X_h[col], errors='coerce')
+        # If the column is mostly numbers, keep the conversion
+        if converted.notna().sum() > (len(X_h) * 0.5):
+            X_h[col] = converted
+            numeric_cols.append(col)
+    return X_h, y_h, numeric_cols
+
 # ---------------------------------------------------
 # Encode categorical columns
 # ---------------------------------------------------
 def encode_categorical(df):
     encoders = {}
     cat_cols = df.select_dtypes(include=["object", "category"]).columns
-    
+
     print(f"  > Encoding {len(cat_cols)} categorical columns...")
     for col in tqdm(cat_cols, desc="Encoding", leave=False):
         le = LabelEncoder()
@@ -27,15 +138,40 @@ def encode_categorical(df):
         encoders[col] = le
     return df, encoders
 
+
+def extend_encoders(df, encoders):
+    # Unseen labels are appended to classes_, so existing codes never move.
+    # LabelEncoder maps object classes through a dict, so order is free.
+    # Loop over the fitted encoders, not the batch dtypes: an all-NaN or
+    # numeric-looking batch column is still a label column.
+    for col, le in encoders.items():
+        if col not in df.columns:
+            continue
+        values = df[col].astype(object).where(df[col].notna(), "Unknown").astype(str)
+
+        known = set(le.classes_)
+        new = sorted(v for v in values.unique() if v not in known)
+        if new:
+            print(f"  > {col}: adding {len(new)} new label(s)")
+            le.classes_ = np.concatenate([le.classes_, np.array(new, dtype=object)])
+
+        codes = {label: i for i, label in enumerate(le.classes_)}
+        df[col] = values.map(codes)
+    return df, encoders
+
 # ---------------------------------------------------
 # Clean Missing Values
 # ---------------------------------------------------
-def clean_missing(df):
-    # Numeric → median
+def clean_missing(df, stats=None):
+    # Numeric → median (running median when stats are given)
     num_cols = df.select_dtypes(include=["int64", "float64"]).columns
     for col in num_cols:
         if df[col].isnull().any():
-            df[col] = df[col].fillna(df[col].median())
+            if stats and col in stats:
+                fill = stats_median(stats[col])
+            else:
+                fill = df[col].median()
+            df[col] = df[col].fillna(fill)
 
     # Categorical → Unknown
     cat_cols = df.select_dtypes(include="object").columns
@@ -43,6 +179,185 @@ def clean_missing(df):
         df[col] = df[col].fillna("Unknown")
     return df
 
+# ---------------------------------------------------
+# Running statistics for imputation + drift checks
+# ---------------------------------------------------
+def init_missing_stats(df):
+    # Quantile-edged histogram per numeric column: the median can be
+    # read back in O(bins) and new rows are added in O(rows).
+    stats = {}
+    num_cols = df.select_dtypes(include=["int64", "float64"]).columns
+    for col in num_cols:
+        values = df[col].dropna().to_numpy(dtype=float)
+        if len(values) == 0:
+            continue
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, MEDIAN_BINS + 1)))
+        if len(edges) < 2:
+            edges = np.array([edges[0], edges[0] + 1.0])
+        stats[col] = {
+            "edges": edges,
+            "counts": np.zeros(len(edges) - 1),
+            "n": 0,
+            "sum": 0.0,
+            "sumsq": 0.0
+        }
+    return update_missing_stats(stats, df)
+
+
+def update_missing_stats(stats, df):
+    for col, s in stats.items():
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").dropna().to_numpy(dtype=float)
+        if len(values) == 0:
+            continue
+        # Out-of-range values land in the outermost bins
+        clipped = np.clip(values, s["edges"][0], s["edges"][-1])
+        s["counts"] += np.histogram(clipped, bins=s["edges"])[0]
+        s["n"] += len(values)
+        s["sum"] += values.sum()
+        s["sumsq"] += np.square(values).sum()
+    return stats
+
+
+def stats_median(s):
+    cum = np.cumsum(s["counts"])
+    half = cum[-1] / 2
+    i = int(np.searchsorted(cum, half))
+    prev = cum[i - 1] if i > 0 else 0.0
+    frac = (half - prev) / s["counts"][i] if s["counts"][i] else 0.0
+    return s["edges"][i] + frac * (s["edges"][i + 1] - s["edges"][i])
+
+
+def stats_medians(stats):
+    return {col: float(stats_median(s)) for col, s in stats.items()}
+
+
+def detect_drift(stats, df):
+    drifted = []
+    for col, s in stats.items():
+        if col not in df.columns or s["n"] < 2:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").dropna()
+        if values.empty:
+            continue
+        mean = s["sum"] / s["n"]
+        std = np.sqrt(max(s["sumsq"] / s["n"] - mean ** 2, 0.0))
+        if std > 0 and abs(values.mean() - mean) / std > DRIFT_THRESHOLD:
+            drifted.append(col)
+    return drifted
+
+# ---------------------------------------------------
+# Warm-start boosting on new rows
+# ---------------------------------------------------
+def _fold_index(base_bins, delta_bins, k):
+    # Delta bin that holds the values of base bin k
+    # (0 = missing, 1..n = bins, last = unknown)
+    if isinstance(base_bins, dict):
+        for category, idx in base_bins.items():
+            if idx == k:
+                return delta_bins.get(category, -1) if isinstance(delta_bins, dict) else -1
+        return 0 if k == 0 else -1
+
+    if k == 0:
+        return 0
+    if k > len(base_bins) + 1:
+        return -1
+    if isinstance(delta_bins, dict):
+        return -1
+    # Lower edge of base bin k (anything below the first cut for bin 1)
+    x = base_bins[k - 2] if k >= 2 else -np.inf
+    return int(np.searchsorted(delta_bins, x, side="right")) + 1
+
+
+def boost_on_new_rows(model, X_new, y_new, params):
+    # Fit a main-effects-only EBM on the residual of the current model
+    # (init_score), binned on the model's own cuts, then add its scores into
+    # the model's main-effect terms. Bins, terms and bags stay the same size,
+    # so each update costs only the new rows.
+    feature_types = []
+    for bins, ftype in zip(model.bins_, model.feature_types_in_):
+        if ftype == "continuous" and len(bins[0]) > 0:
+            feature_types.append([float(c) for c in bins[0]])
+        else:
+            feature_types.append(ftype)
+
+    delta = type(model)(**{
+        **params,
+        "interactions": 0,
+        "outer_bags": DELTA_OUTER_BAGS,
+        "feature_types": feature_types
+    })
+    delta.fit(X_new, y_new, init_score=model)
+
+    model = copy.deepcopy(model)
+    base_terms = {tuple(f): t for t, f in enumerate(model.term_features_)}
+    for d, features in enumerate(delta.term_features_):
+        if len(features) != 1 or tuple(features) not in base_terms:
+            continue
+        t = base_terms[tuple(features)]
+        feature = features[0]
+        base_bins = model.bins_[feature][0]
+        delta_bins = delta.bins_[feature][0]
+
+        # Labels the model has never binned stay in its unknown bin
+        shift = np.zeros_like(model.term_scores_[t])
+        weights = np.zeros_like(model.bin_weights_[t])
+        for k in range(len(shift)):
+            j = _fold_index(base_bins, delta_bins, k)
+            if j != -1:
+                weights[k] = delta.bin_weights_[d][j]
+            # Shrink thinly supported bins: a day's batch spreads over the
+            # model's full-history cuts, so most bins hold only a few rows
+            shift[k] = delta.term_scores_[d][j] * weights[k] / (weights[k] + DELTA_SHRINK_ROWS)
+
+        # Shift every bag equally: the bag mean moves, the spread
+        # (standard_deviations_) does not
+        model.term_scores_[t] = model.term_scores_[t] + shift
+        model.bagged_scores_[t] = model.bagged_scores_[t] + shift
+        model.bin_weights_[t] = model.bin_weights_[t] + weights
+
+        # Re-center like a full fit so intercept_ stays the base score
+        # (test_model reports it as the "Base Premium")
+        total = np.sum(model.bin_weights_[t])
+        if total > 0:
+            mean = np.sum(model.term_scores_[t] * model.bin_weights_[t]) / total
+            model.term_scores_[t] = model.term_scores_[t] - mean
+            model.bagged_scores_[t] = model.bagged_scores_[t] - mean
+            model.intercept_ = model.intercept_ + mean
+            model.bagged_intercept_ = model.bagged_intercept_ + mean
+
+    # On (nearly) separable labels the classifier delta's intercept runs off
+    # to huge negative logits, so the intercept is held fixed there and only
+    # the centered term means move it.
+    if not isinstance(model, ExplainableBoostingClassifier):
+        model.intercept_ = model.intercept_ + delta.intercept_
+        model.bagged_intercept_ = model.bagged_intercept_ + np.ravel(delta.intercept_)[0]
+    return model
+
+
+def holdout_loss(model, X, y):
+    if isinstance(model, ExplainableBoostingClassifier):
+        return log_loss(y, model.predict_proba(X)[:, 1], labels=[0, 1])
+    return mean_squared_error(y, model.predict(X))
+
+
+def boost_with_holdout(model, X_new, y_new, params):
+    # Boost on the older rows of the batch, check on the newest ones.
+    # Returns None when the update does worse than the current model.
+    n_hold = max(1, int(len(X_new) * DELTA_HOLDOUT))
+    X_fit, X_hold = X_new.iloc[:-n_hold], X_new.iloc[-n_hold:]
+    y_fit, y_hold = y_new.iloc[:-n_hold], y_new.iloc[-n_hold:]
+
+    updated = boost_on_new_rows(model, X_fit, y_fit, params)
+
+    old_loss = holdout_loss(model, X_hold, y_hold)
+    new_loss = holdout_loss(updated, X_hold, y_hold)
+    print(f"  > Held-out loss: {old_loss:.4f} -> {new_loss:.4f}")
+    if new_loss > old_loss * (1 + DELTA_TOLERANCE) + 1e-12:
+        return None
+    return updated
+
 # ---------------------------------------------------
 # MAIN TRAINING FUNCTION
 # ---------------------------------------------------
@@ -51,24 +366,13 @@ def train_models():
     # 1️⃣ FINANCE MODEL — Loan Approval
     # ==================================================
     print("\n[1/2] Training Financial Model...")
-    
+
     try:
-        df_f = pd.read_csv("loan_data.csv")
-        df_f.columns = df_f.columns.str.strip()
-        df_f = df_f.replace("", np.nan)
-
-        # Normalize labels
-        df_f["loan_status"] = df_f["loan_status"].astype(str).str.strip().str.capitalize()
-        df_f.loc[~df_f["loan_status"].isin(["Approved", "Rejected"]), "loan_status"] = "Rejected"
-
-        # Feature Engineering
-        df_f["loan_to_income_ratio"] = df_f["loan_amount"] / (df_f["income_annum"] + 1)
-        df_f["total_assets"] = (df_f["residential_assets_value"] + df_f["commercial_assets_value"] + 
-                               df_f["luxury_assets_value"] + df_f["bank_asset_value"])
-        
-        y_f = df_f["loan_status"].map({"Approved": 1, "Rejected": 0})
-        X_f = df_f.drop(columns=["loan_id", "loan_status"], errors="ignore")
-        
+        df_f, fin_offset = read_csv_tail("loan_data.csv")
+        X_f, y_f = prepare_finance(df_f)
+        fin_columns = df_f.columns.tolist()
+
+        fin_stats = init_missing_stats(X_f)
         X_f = clean_missing(X_f)
         X_f, fin_encoders = encode_categorical(X_f)
 
@@ -81,10 +385,11 @@ def train_models():
             n_jobs=-1,      # Use all CPU cores
             random_state=42
         )
-        
+
         print("  > Fitting Finance EBM...")
         ebm_fin.fit(Xf_train, yf_train)
-        print(f"  > Financial Accuracy: {accuracy_score(yf_test, ebm_fin.predict(Xf_test)):.4f}")
+        fin_acc = accuracy_score(yf_test, ebm_fin.predict(Xf_test))
+        print(f"  > Financial Accuracy: {fin_acc:.4f}")
 
     except FileNotFoundError:
         print("  ! Error: realistic_loan_data.csv not found.")
@@ -94,25 +399,13 @@ def train_models():
     # 2️⃣ HEALTH MODEL — Claim Prediction
     # ==================================================
     print("\n[2/2] Training Health Model...")
-    
+
     try:
-        df_h = pd.read_csv("hi.csv")
-        df_h.columns = df_h.columns.str.strip()
-        
-        if "claim" not in df_h.columns:
-            raise ValueError(f"'claim' missing. Found: {df_h.columns.tolist()}")
-
-        y_h = df_h["claim"]
-        X_h = df_h.drop(columns=["claim"])
-
-        # FIX: Safe Numeric Conversion
-        for col in X_h.columns:
-            # Attempt numeric conversion, invalid becomes NaN
-            converted = pd.to_numeric(X_h[col], errors='coerce')
-            # If the column is mostly numbers, keep the conversion
-            if converted.notna().sum() > (len(X_h) * 0.5):
-                X_h[col] = converted
+        df_h, health_offset = read_csv_tail("hi.csv")
+        X_h, y_h, health_numeric = prepare_health(df_h)
+        health_columns = df_h.columns.tolist()
 
+        health_stats = init_missing_stats(X_h)
         X_h = clean_missing(X_h)
         X_h, health_encoders = encode_categorical(X_h)
 
@@ -131,7 +424,7 @@ def train_models():
 
         print("  > Fitting Health EBM (this may take a minute)...")
         ebm_health.fit(Xh_train, yh_train)
-        
+
         r2 = r2_score(yh_test, ebm_health.predict(Xh_test))
         print(f"  > Health R2 Score: {r2:.4f}")
 
@@ -142,19 +435,215 @@ def train_models():
     # ==================================================
     # SAVE MODELS
     # ==================================================
+    state = {
+        "finance": {
+            "offset": fin_offset,
+            "file": csv_fingerprint("loan_data.csv", fin_offset),
+            "columns": fin_columns,
+            "stats": fin_stats,
+            "params": ebm_fin.get_params(),
+            "baseline": fin_acc
+        },
+        "health": {
+            "offset": health_offset,
+            "file": csv_fingerprint("hi.csv", health_offset),
+            "columns": health_columns,
+            "numeric_cols": health_numeric,
+            "stats": health_stats,
+            "params": ebm_health.get_params(),
+            "baseline": r2
+        }
+    }
+
     print("\nSaving Models...")
     files = {
         "ebm_finance.pkl": ebm_fin,
         "ebm_health.pkl": ebm_health,
         "fin_encoders.pkl": fin_encoders,
-        "health_encoders.pkl": health_encoders
+        "health_encoders.pkl": health_encoders,
+        STATE_FILE: state
     }
-    
+
     for filename, obj in tqdm(files.items(), desc="Saving"):
         with open(filename, "wb") as f:
             pickle.dump(obj, f)
 
+    # Lightweight tables for score.py
+    export_tables(ebm_fin, fin_encoders, TABLE_FILES["finance"], stats_medians(fin_stats))
+    export_tables(ebm_health, health_encoders, TABLE_FILES["health"], stats_medians(health_stats))
+
     print("\nSUCCESS: Training Complete!")
 
+# ---------------------------------------------------
+# INCREMENTAL UPDATE (new rows only)
+# ---------------------------------------------------
+def update_models():
+    start = time.time()
+
+    try:
+        with open("ebm_finance.pkl", "rb") as f:
+            ebm_fin = pickle.load(f)
+
+        with open("ebm_health.pkl", "rb") as f:
+            ebm_health = pickle.load(f)
+
+        with open("fin_encoders.pkl", "rb") as f:
+            fin_encoders = pickle.load(f)
+
+        with open("health_encoders.pkl", "rb") as f:
+            health_encoders = pickle.load(f)
+
+        with open(STATE_FILE, "rb") as f:
+            state = pickle.load(f)
+
+    except FileNotFoundError:
+        print("  ! No incremental state found. Running full training...")
+        train_models()
+        return
+
+    fin_state = state["finance"]
+    health_state = state["health"]
+
+    # ==================================================
+    # 1️⃣ FINANCE MODEL — new decisions
+    # ==================================================
+    print("\n[1/2] Updating Financial Model...")
+
+    try:
+        if csv_replaced("loan_data.csv", fin_state["offset"], fin_state["file"]):
+            print("  ! loan_data.csv was replaced, not appended to. Refitting...")
+            train_models()
+            return
+        df_f, fin_offset = read_csv_tail("loan_data.csv", fin_state["offset"], fin_state["columns"])
+    except FileNotFoundError:
+        print("  ! Error: loan_data.csv not found.")
+        return
+    fin_updated = False
+
+    if len(df_f) < MIN_INCREMENTAL_ROWS:
+        print(f"  > {len(df_f)} new rows (< {MIN_INCREMENTAL_ROWS}), skipping.")
+    else:
+        X_f, y_f = prepare_finance(df_f)
+
+        drifted = detect_drift(fin_state["stats"], X_f)
+        if drifted:
+            print(f"  ! Drift detected in {drifted}. Refitting...")
+            train_models()
+            return
+
+        update_missing_stats(fin_state["stats"], X_f)
+        X_f, fin_encoders = extend_encoders(X_f, fin_encoders)
+        X_f = clean_missing(X_f, fin_state["stats"])
+
+        acc = accuracy_score(y_f, ebm_fin.predict(X_f))
+        print(f"  > Accuracy on {len(X_f)} new rows: {acc:.4f}")
+        if acc < fin_state["baseline"] - ACCURACY_DROP:
+            print("  ! Accuracy dropped below baseline. Refitting...")
+            train_models()
+            return
+
+        if y_f.nunique() < 2:
+            print("  > New rows contain a single class, skipping boosting.")
+        else:
+            print("  > Boosting Finance EBM on new rows...")
+            ebm_fin = boost_with_holdout(ebm_fin, X_f, y_f, fin_state["params"])
+            if ebm_fin is None:
+                print("  ! Update did worse on held-out new rows. Refitting...")
+                train_models()
+                return
+
+        fin_state["offset"] = fin_offset
+        fin_state["file"] = csv_fingerprint("loan_data.csv", fin_offset)
+        fin_updated = True
+
+    # ==================================================
+    # 2️⃣ HEALTH MODEL — new claims
+    # ==================================================
+    print("\n[2/2] Updating Health Model...")
+
+    try:
+        if csv_replaced("hi.csv", health_state["offset"], health_state["file"]):
+            print("  ! hi.csv was replaced, not appended to. Refitting...")
+            train_models()
+            return
+        df_h, health_offset = read_csv_tail("hi.csv", health_state["offset"], health_state["columns"])
+    except FileNotFoundError:
+        print("  ! Error: hi.csv not found.")
+        return
+    health_updated = False
+
+    if len(df_h) < MIN_INCREMENTAL_ROWS:
+        print(f"  > {len(df_h)} new rows (< {MIN_INCREMENTAL_ROWS}), skipping.")
+    else:
+        X_h, y_h, _ = prepare_health(df_h, health_state["numeric_cols"])
+
+        drifted = detect_drift(health_state["stats"], X_h)
+        if drifted:
+            print(f"  ! Drift detected in {drifted}. Refitting...")
+            train_models()
+            return
+
+        update_missing_stats(health_state["stats"], X_h)
+        X_h, health_encoders = extend_encoders(X_h, health_encoders)
+        X_h = clean_missing(X_h, health_state["stats"])
+
+        r2 = r2_score(y_h, ebm_health.predict(X_h))
+        print(f"  > R2 on {len(X_h)} new rows: {r2:.4f}")
+        if r2 < health_state["baseline"] - R2_DROP:
+            print("  ! R2 dropped below baseline. Refitting...")
+            train_models()
+            return
+
+        print("  > Boosting Health EBM on new rows...")
+        ebm_health = boost_with_holdout(ebm_health, X_h, y_h, health_state["params"])
+        if ebm_health is None:
+            print("  ! Update did worse on held-out new rows. Refitting...")
+            train_models()
+            return
+
+        health_state["offset"] = health_offset
+        health_state["file"] = csv_fingerprint("hi.csv", health_offset)
+        health_updated = True
+
+    # ==================================================
+    # SAVE MODELS
+    # ==================================================
+    if not (fin_updated or health_updated):
+        print("\nNothing to update.")
+        return
+
+    print("\nSaving Models...")
+    files = {STATE_FILE: state}
+    if fin_updated:
+        files["ebm_finance.pkl"] = ebm_fin
+        files["fin_encoders.pkl"] = fin_encoders
+    if health_updated:
+        files["ebm_health.pkl"] = ebm_health
+        files["health_encoders.pkl"] = health_encoders
+
+    for filename, obj in tqdm(files.items(), desc="Saving"):
+        with open(filename, "wb") as f:
+            pickle.dump(obj, f)
+
+    if fin_updated:
+        export_tables(ebm_fin, fin_encoders, TABLE_FILES["finance"],
+                      stats_medians(fin_state["stats"]))
+    if health_updated:
+        export_tables(ebm_health, health_encoders, TABLE_FILES["health"],
+                      stats_medians(health_state["stats"]))
+
+    print(f"\nSUCCESS: Incremental update complete in {time.time() - start:.1f}s")
+
 if __name__ == "__main__":
-    train_models()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Train the Kavach EBM models.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Update models from rows appended since the last run (refits on drift/accuracy triggers)"
+    )
+    args = parser.parse_args()
+
+    if args.incremental:
+        update_models()
+    else:
+        train_models()